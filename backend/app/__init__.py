@@ -13,7 +13,7 @@ def create_app():
         r"/api/*": {
             "origins": ["chrome-extension://*"],
             "methods": ["GET", "POST", "PUT", "DELETE", "OPTIONS"],
-            "allow_headers": ["Content-Type", "Accept", "Origin"],
+            "allow_headers": ["Content-Type", "Accept", "Origin", "X-Client-Id"],
             "supports_credentials": True
         }
     })
@@ -0,0 +1,97 @@
+import itertools
+import json
+import queue
+import threading
+
+# Per-subscriber buffer size; a client that falls this far behind is told to resync
+CLIENT_BUFFER_SIZE = 256
+# Seconds between keep-alive comments on an idle stream
+HEARTBEAT_INTERVAL = 15
+
+
+class Subscriber:
+    def __init__(self, project_id=None, client_id=None, maxsize=CLIENT_BUFFER_SIZE):
+        self.project_id = project_id
+        self.client_id = client_id
+        self.queue = queue.Queue(maxsize=maxsize)
+
+    def wants(self, event, origin=None):
+        # Writers already updated their own view
+        if origin is not None and origin == self.client_id:
+            return False
+        # Project-less events (e.g. new projects) go to everyone
+        return (self.project_id is None
+                or event['project'] is None
+                or event['project'] == self.project_id)
+
+    def offer(self, event):
+        try:
+            self.queue.put_nowait(event)
+        except queue.Full:
+            # Drop the backlog and ask the client to refetch instead of blocking writers
+            with self.queue.mutex:
+                self.queue.queue.clear()
+            self.queue.put_nowait({'op': 'resync'})
+
+
+class EventBroker:
+    """In-process pub/sub fanning out change events to SSE subscribers."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers = set()
+        self._ids = itertools.count(1)
+
+    def subscribe(self, project_id=None, client_id=None):
+        subscriber = Subscriber(project_id, client_id)
+        with self._lock:
+            self._subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        with self._lock:
+            self._subscribers.discard(subscriber)
+
+    def subscriber_count(self):
+        with self._lock:
+            return len(self._subscribers)
+
+    def publish(self, entity, entity_id, project_id, op, parent_id=None, origin=None):
+        # parent is the owning question for notes, so clients can patch in place
+        event = {
+            'id': next(self._ids),
+            'entity': entity,
+            'entity_id': entity_id,
+            'project': project_id,
+            'parent': parent_id,
+            'op': op
+        }
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for subscriber in subscribers:
+            if subscriber.wants(event, origin):
+                subscriber.offer(event)
+        return event
+
+    def stream(self, subscriber, resume=False):
+        """Yield SSE frames for a subscriber until the client disconnects."""
+        try:
+            yield 'retry: 3000\n\n'
+            if resume:
+                # No history is kept, so a reconnecting client must refetch
+                yield 'event: resync\ndata: {}\n\n'
+            while True:
+                try:
+                    event = subscriber.queue.get(timeout=HEARTBEAT_INTERVAL)
+                except queue.Empty:
+                    yield ': keep-alive\n\n'
+                    continue
+                if event['op'] == 'resync':
+                    yield 'event: resync\ndata: {}\n\n'
+                    continue
+                yield f"id: {event['id']}\nevent: change\ndata: {json.dumps(event)}\n\n"
+        finally:
+            self.unsubscribe(subscriber)
+
+
+broker = EventBroker()
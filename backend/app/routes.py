@@ -1,8 +1,14 @@
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, Response, jsonify, request
 from .models import db, Project, URLInfo, Question, QuestionNote
+from .events import broker
 
 main_bp = Blueprint('main', __name__)
 
+def publish_change(entity, entity_id, project_id, op, parent_id=None):
+    # Tag with the writing client so its own event stream skips the echo
+    broker.publish(entity, entity_id, project_id, op, parent_id,
+                   origin=request.headers.get('X-Client-Id'))
+
 # Add OPTIONS route handler for CORS preflight
 @main_bp.route('/api/notes/<int:note_id>', methods=['OPTIONS'])
 def handle_notes_options(note_id):
@@ -21,6 +27,7 @@ def update_note(note_id):
     try:
         note.note = data['note']
         db.session.commit()
+        publish_change('note', note.id, note.question.project_id, 'update', note.question_id)
         return jsonify(note.to_dict()), 200
     except Exception as e:
         db.session.rollback()
@@ -32,9 +39,12 @@ def delete_note(note_id):
     if not note:
         return jsonify({'error': 'Note not found'}), 404
     
+    project_id = note.question.project_id
+    question_id = note.question_id
     try:
         db.session.delete(note)
         db.session.commit()
+        publish_change('note', note_id, project_id, 'delete', question_id)
         return jsonify({'message': 'Note deleted successfully'}), 200
     except Exception as e:
         db.session.rollback()
@@ -55,6 +65,7 @@ def create_project():
     try:
         db.session.add(project)
         db.session.commit()
+        publish_change('project', project.id, None, 'create')
         return jsonify(project.to_dict()), 201
     except Exception as e:
         db.session.rollback()
@@ -114,6 +125,7 @@ def create_question():
         )
         db.session.add(question)
         db.session.commit()
+        publish_change('question', question.id, question.project_id, 'create')
         return jsonify(question.to_dict()), 201
     except Exception as e:
         db.session.rollback()
@@ -143,6 +155,7 @@ def save_url():
     try:
         # Get or create URL info if provided
         url_info = None
+        url_created = False
         if data.get('url'):
             url_info = URLInfo.query.filter_by(url=data['url'], project_id=data['project_id']).first()
             if not url_info:
@@ -153,6 +166,7 @@ def save_url():
                 )
                 db.session.add(url_info)
                 db.session.flush()  # Get the URL ID
+                url_created = True
         
         # Create note with question association
         if data.get('note'):
@@ -169,6 +183,11 @@ def save_url():
         
         db.session.commit()
         
+        if url_created:
+            publish_change('url', url_info.id, url_info.project_id, 'create')
+        if data.get('note'):
+            publish_change('note', note.id, question.project_id, 'create', question.id)
+        
         return jsonify({
             'note': note.to_dict() if data.get('note') else None,
             'url_info': url_info.to_dict() if url_info else None
@@ -228,6 +247,7 @@ def add_url_note(url_id):
     try:
         db.session.add(note)
         db.session.commit()
+        publish_change('note', note.id, question.project_id, 'create', question.id)
         return jsonify(note.to_dict()), 201
     except Exception as e:
         db.session.rollback()
@@ -244,9 +264,11 @@ def delete_question(question_id):
     if not question:
         return jsonify({'error': 'Question not found'}), 404
     
+    project_id = question.project_id
     try:
         db.session.delete(question)
         db.session.commit()
+        publish_change('question', question_id, project_id, 'delete')
         return jsonify({'message': 'Question deleted successfully'}), 200
     except Exception as e:
         db.session.rollback()
@@ -262,6 +284,7 @@ def update_question_status(question_id):
         # Toggle status
         question.status = 'finished' if question.status == 'to_research' else 'to_research'
         db.session.commit()
+        publish_change('question', question.id, question.project_id, 'update')
         return jsonify(question.to_dict()), 200
     except Exception as e:
         db.session.rollback()
@@ -280,6 +303,7 @@ def update_question(question_id):
     try:
         question.text = data['text']
         db.session.commit()
+        publish_change('question', question.id, question.project_id, 'update')
         return jsonify(question.to_dict()), 200
     except Exception as e:
         db.session.rollback()
@@ -304,6 +328,7 @@ def update_question_notes(question_id):
         
         # Get or create URL info for current URL if provided
         current_url_id = None
+        url_created = False
         if data.get('current_url'):
             url_info = URLInfo.query.filter_by(url=data['current_url'], project_id=question.project_id).first()
             if not url_info:
@@ -314,6 +339,7 @@ def update_question_notes(question_id):
                 )
                 db.session.add(url_info)
                 db.session.flush()  # Get the URL ID
+                url_created = True
             current_url_id = url_info.id
         
         # Delete all existing notes
@@ -339,8 +365,23 @@ def update_question_notes(question_id):
         
         # Return updated question with notes
         question = Question.query.get(question_id)
+        if url_created:
+            publish_change('url', current_url_id, question.project_id, 'create')
+        publish_change('question', question.id, question.project_id, 'update')
         return jsonify(question.to_dict()), 200
     except Exception as e:
         db.session.rollback()
         print(f"Error updating notes: {str(e)}")  # Add debug logging
-        return jsonify({'error': 'Failed to update notes'}), 400 
\ No newline at end of file
+        return jsonify({'error': 'Failed to update notes'}), 400
+
+@main_bp.route('/api/events', methods=['GET'])
+def stream_events():
+    # Optional project filter; project-level events are always delivered
+    project_id = request.args.get('project_id', type=int)
+    subscriber = broker.subscribe(project_id, request.args.get('client_id'))
+    # Events published while a client was reconnecting are not replayed
+    resume = 'Last-Event-ID' in request.headers
+    return Response(broker.stream(subscriber, resume), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
@@ -1,4 +1,6 @@
 const API_BASE_URL = 'http://localhost:5000/api';
+// Sent with every write so the event stream does not echo our own changes back
+const CLIENT_ID = crypto.randomUUID();
 
 // Show message in the popup
 function showMessage(text, isError = false) {
@@ -103,6 +105,7 @@ async function createProject(name) {
             method: 'POST',
             headers: {
                 'Content-Type': 'application/json',
+                'X-Client-Id': CLIENT_ID,
             },
             body: JSON.stringify({ name }),
         });
@@ -131,6 +134,7 @@ async function createQuestion(projectId, text, parentId = null) {
             method: 'POST',
             headers: {
                 'Content-Type': 'application/json',
+                'X-Client-Id': CLIENT_ID,
             },
             body: JSON.stringify({ 
                 project_id: projectId,
@@ -194,6 +198,7 @@ async function saveCurrentUrl(projectId) {
             method: 'POST',
             headers: {
                 'Content-Type': 'application/json',
+                'X-Client-Id': CLIENT_ID,
             },
             body: JSON.stringify(requestBody),
         });
@@ -287,7 +292,10 @@ async function loadQuestionHistory() {
 async function toggleQuestionStatus(questionId) {
     try {
         const response = await fetch(`${API_BASE_URL}/questions/${questionId}/status`, {
-            method: 'PUT'
+            method: 'PUT',
+            headers: {
+                'X-Client-Id': CLIENT_ID,
+            },
         });
         
         if (!response.ok) {
@@ -311,7 +319,10 @@ async function toggleQuestionStatus(questionId) {
 async function deleteQuestion(questionId) {
     try {
         const response = await fetch(`${API_BASE_URL}/questions/${questionId}`, {
-            method: 'DELETE'
+            method: 'DELETE',
+            headers: {
+                'X-Client-Id': CLIENT_ID,
+            },
         });
         
         if (!response.ok) {
@@ -537,6 +548,7 @@ async function updateQuestionText(questionId, newText) {
             method: 'PUT',
             headers: {
                 'Content-Type': 'application/json',
+                'X-Client-Id': CLIENT_ID,
             },
             body: JSON.stringify({ text: newText }),
         });
@@ -566,6 +578,7 @@ async function updateQuestionNotes(questionId, newNotes) {
             method: 'PUT',
             headers: {
                 'Content-Type': 'application/json',
+                'X-Client-Id': CLIENT_ID,
             },
             body: JSON.stringify({ 
                 notes: notesArray.join('\n\n'),
@@ -686,23 +699,7 @@ function displayQuestions(questions) {
 
         const notesContainer = document.createElement('div');
         notesContainer.className = 'notes-container';
-        
-        const sortedNotes = question.notes.sort((a, b) => new Date(b.created_at) - new Date(a.created_at));
-        
-        sortedNotes.forEach(note => {
-            const noteBox = document.createElement('div');
-            noteBox.className = 'note-box';
-            noteBox.textContent = note.note;
-            
-            noteBox.addEventListener('dblclick', () => makeNoteEditable(note, noteBox));
-            noteBox.addEventListener('contextmenu', (e) => {
-                e.preventDefault();
-                e.stopPropagation();
-                showNoteContextMenu(e, note, noteBox);
-            });
-            
-            notesContainer.appendChild(noteBox);
-        });
+        renderNotes(notesContainer, question.notes);
 
         questionItem.appendChild(questionBox);
         questionItem.appendChild(notesContainer);
@@ -710,6 +707,29 @@ function displayQuestions(questions) {
     });
 }
 
+// Render a question's notes into its notes container
+function renderNotes(notesContainer, notes) {
+    notesContainer.innerHTML = '';
+
+    const sortedNotes = notes.sort((a, b) => new Date(b.created_at) - new Date(a.created_at));
+    
+    sortedNotes.forEach(note => {
+        const noteBox = document.createElement('div');
+        noteBox.className = 'note-box';
+        noteBox.setAttribute('data-note-id', note.id);
+        noteBox.textContent = note.note;
+        
+        noteBox.addEventListener('dblclick', () => makeNoteEditable(note, noteBox));
+        noteBox.addEventListener('contextmenu', (e) => {
+            e.preventDefault();
+            e.stopPropagation();
+            showNoteContextMenu(e, note, noteBox);
+        });
+        
+        notesContainer.appendChild(noteBox);
+    });
+}
+
 // Make question text editable on double click
 function makeQuestionEditable(question, questionBox) {
     const editContainer = document.createElement('div');
@@ -950,6 +970,7 @@ async function updateNote(noteId, newNote) {
                 'Content-Type': 'application/json',
                 'Accept': 'application/json',
                 'Origin': chrome.runtime.getURL(''),
+                'X-Client-Id': CLIENT_ID,
             },
             credentials: 'include',
             body: JSON.stringify({ note: newNote }),
@@ -976,6 +997,7 @@ async function deleteNote(noteId) {
             headers: {
                 'Accept': 'application/json',
                 'Origin': chrome.runtime.getURL(''),
+                'X-Client-Id': CLIENT_ID,
             },
             credentials: 'include'
         });
@@ -1111,6 +1133,150 @@ async function addFollowupQuestion() {
     };
 }
 
+// Live updates pushed by the backend over /api/events
+let eventSource = null;
+let pendingRefresh = null;
+
+function historyViewActive() {
+    return document.getElementById('historyView').classList.contains('active');
+}
+
+// Rebuilding the history list would discard an open editor and its unsaved text
+function isEditing(container) {
+    return container.querySelector('.editing, .edit-container') !== null;
+}
+
+// Coalesce bursts of events into a single refetch of the affected lists
+function scheduleRefresh({ projects = false, dropdown = false, history = false }) {
+    if (!pendingRefresh) {
+        pendingRefresh = { projects: false, dropdown: false, history: false };
+        setTimeout(runPendingRefresh, 200);
+    }
+    pendingRefresh.projects = pendingRefresh.projects || projects;
+    pendingRefresh.dropdown = pendingRefresh.dropdown || dropdown;
+    pendingRefresh.history = pendingRefresh.history || history;
+}
+
+async function runPendingRefresh() {
+    if (pendingRefresh.history && historyViewActive() && isEditing(document.getElementById('questionsList'))) {
+        // Try again once the editor is closed
+        setTimeout(runPendingRefresh, 1000);
+        return;
+    }
+
+    const { projects, dropdown, history } = pendingRefresh;
+    pendingRefresh = null;
+    if (projects) {
+        await loadProjects();
+        const historyProjectSelect = document.getElementById('historyProjectSelect');
+        const historyProjectId = historyProjectSelect.value;
+        await loadProjects('historyProjectSelect');
+        historyProjectSelect.value = historyProjectId;
+    }
+    const projectId = document.getElementById('projectSelect').value;
+    if (dropdown && projectId) {
+        loadQuestions(projectId);
+    }
+    if (history && historyViewActive()) {
+        loadQuestionHistory();
+    }
+}
+
+// Refetch the notes of a single question in the history view
+async function refreshQuestionNotes(questionId) {
+    const questionItem = document.querySelector(`#questionsList [data-question-id="${questionId}"]`);
+    if (!questionItem) {
+        return;
+    }
+    if (isEditing(questionItem)) {
+        scheduleRefresh({ history: true });
+        return;
+    }
+
+    try {
+        const response = await fetch(`${API_BASE_URL}/questions/${questionId}/notes`);
+        const notes = await response.json();
+        renderNotes(questionItem.querySelector('.notes-container'), notes);
+    } catch (error) {
+        showMessage('Failed to load notes', true);
+    }
+}
+
+// Apply a change made by another client to the current view
+function handleChangeEvent(change) {
+    if (change.entity === 'project') {
+        scheduleRefresh({ projects: true });
+        return;
+    }
+
+    // URLs are not listed in the popup, only their notes
+    if (change.entity === 'url') {
+        return;
+    }
+
+    // Ignore changes to projects that are not on screen
+    const project = String(change.project);
+    const inDropdown = project === document.getElementById('projectSelect').value;
+    const historyProjectId = document.getElementById('historyProjectSelect').value;
+    const inHistory = historyViewActive() && (!historyProjectId || project === historyProjectId);
+    if (!inDropdown && !inHistory) {
+        return;
+    }
+
+    if (change.entity === 'note') {
+        // Notes only appear in the history view and are patched per question
+        if (!inHistory) {
+            return;
+        }
+        if (change.op === 'delete') {
+            const noteBox = document.querySelector(`#questionsList [data-note-id="${change.entity_id}"]`);
+            if (noteBox) {
+                noteBox.remove();
+            }
+        } else {
+            refreshQuestionNotes(change.parent);
+        }
+        return;
+    }
+
+    if (change.op === 'delete') {
+        // Deletes can be patched in place without a refetch
+        const option = document.querySelector(`#questionSelect option[value="${change.entity_id}"]`);
+        if (option) {
+            option.remove();
+        }
+        const questionItem = document.querySelector(`#questionsList [data-question-id="${change.entity_id}"]`);
+        if (questionItem) {
+            questionItem.remove();
+        }
+        return;
+    }
+
+    scheduleRefresh({ dropdown: inDropdown, history: inHistory });
+}
+
+function subscribeToChanges() {
+    let disconnected = false;
+    eventSource = new EventSource(`${API_BASE_URL}/events?client_id=${CLIENT_ID}`);
+    eventSource.addEventListener('change', (event) => {
+        handleChangeEvent(JSON.parse(event.data));
+    });
+    // The server dropped events for us, so refetch everything
+    eventSource.addEventListener('resync', () => {
+        scheduleRefresh({ projects: true, dropdown: true, history: true });
+    });
+    // Changes made while reconnecting are not replayed
+    eventSource.addEventListener('error', () => {
+        disconnected = true;
+    });
+    eventSource.addEventListener('open', () => {
+        if (disconnected) {
+            disconnected = false;
+            scheduleRefresh({ projects: true, dropdown: true, history: true });
+        }
+    });
+}
+
 // Event Listeners
 document.addEventListener('DOMContentLoaded', async function() {
     // First load projects
@@ -1126,6 +1292,9 @@ document.addEventListener('DOMContentLoaded', async function() {
         });
     });
 
+    // Receive changes made elsewhere instead of polling
+    subscribeToChanges();
+
     // Restore note input content
     restoreNoteInput();
     
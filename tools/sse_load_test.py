@@ -0,0 +1,207 @@
+#!/usr/bin/env python
+import sys
+import json
+import time
+import queue
+import socket
+import argparse
+import threading
+import http.client
+from urllib.parse import urlparse
+
+def request_json(base_url, method, path, body=None):
+    parsed = urlparse(base_url)
+    conn = http.client.HTTPConnection(parsed.hostname, parsed.port or 80, timeout=30)
+    headers = {'Content-Type': 'application/json'} if body is not None else {}
+    conn.request(method, path, body=json.dumps(body) if body is not None else None, headers=headers)
+    response = conn.getresponse()
+    data = json.loads(response.read() or b'null')
+    conn.close()
+    if response.status >= 400:
+        raise RuntimeError(f"{method} {path} failed: {data}")
+    return data
+
+class Subscriber(threading.Thread):
+    """One SSE client reporting (subscriber, event id, question id, arrival time)."""
+
+    def __init__(self, index, base_url, project_id, arrivals, ready):
+        super().__init__(daemon=True)
+        self.index = index
+        self.base_url = base_url
+        self.project_id = project_id
+        self.arrivals = arrivals
+        self.ready = ready
+        self.resyncs = 0
+        self.conn = None
+
+    def run(self):
+        parsed = urlparse(self.base_url)
+        try:
+            self.conn = http.client.HTTPConnection(parsed.hostname, parsed.port or 80, timeout=60)
+            self.conn.request('GET', f'/api/events?project_id={self.project_id}',
+                              headers={'Accept': 'text/event-stream'})
+            response = self.conn.getresponse()
+        except OSError:
+            return
+        self.ready.release()
+        try:
+            while True:
+                line = response.readline()
+                if not line:
+                    break
+                if line.startswith(b'event: resync'):
+                    self.resyncs += 1
+                elif line.startswith(b'data: '):
+                    event = json.loads(line[6:])
+                    if event.get('entity') == 'question' and event.get('op') == 'create':
+                        self.arrivals.put((self.index, event['id'], event['entity_id'], time.perf_counter()))
+        except (OSError, ValueError):
+            pass
+
+    def close(self):
+        # Shut the socket down so the blocked readline returns
+        if self.conn is not None and self.conn.sock is not None:
+            try:
+                self.conn.sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            self.conn.close()
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+def run_level(base_url, project_id, subscribers, writes, timeout):
+    """Connect `subscribers` clients, time `writes` question creations and report delivery."""
+    arrivals = queue.Queue()
+    ready = threading.Semaphore(0)
+    clients = [Subscriber(i, base_url, project_id, arrivals, ready) for i in range(subscribers)]
+    # Arrival time per (subscriber, question id); each write creates its own question
+    received = {}
+    counts = {}
+    sent_at = {}
+
+    def drain(until, question_id=None):
+        # Collect arrivals until `question_id` reached every subscriber, or all writes did
+        while True:
+            if question_id is not None and counts.get(question_id, 0) >= subscribers:
+                return
+            if question_id is None and all(counts.get(qid, 0) >= subscribers for qid in sent_at):
+                return
+            remaining = until - time.perf_counter()
+            if remaining <= 0:
+                return
+            try:
+                index, event_id, entity_id, arrived = arrivals.get(timeout=remaining)
+            except queue.Empty:
+                return
+            if (index, entity_id) not in received:
+                received[(index, entity_id)] = arrived
+                counts[entity_id] = counts.get(entity_id, 0) + 1
+
+    try:
+        for client in clients:
+            client.start()
+        for _ in range(subscribers):
+            if not ready.acquire(timeout=timeout):
+                return None
+
+        started = time.perf_counter()
+        for i in range(writes):
+            sent = time.perf_counter()
+            question = request_json(base_url, 'POST', '/api/questions', {
+                'text': f'SSE load test {time.strftime("%Y%m%d_%H%M%S")} {subscribers}/{i}',
+                'project_id': project_id
+            })
+            sent_at[question['id']] = sent
+            drain(sent + timeout, question['id'])
+        elapsed = time.perf_counter() - started
+        # Late arrivals still count, attributed to the write that caused them
+        drain(time.perf_counter() + timeout)
+    finally:
+        for client in clients:
+            client.close()
+        for question_id in sent_at:
+            request_json(base_url, 'DELETE', f'/api/questions/{question_id}')
+
+    latencies = [(arrived - sent_at[qid]) * 1000
+                 for (_, qid), arrived in received.items() if qid in sent_at]
+    expected = subscribers * writes
+    return {
+        'subscribers': subscribers,
+        'elapsed': elapsed,
+        'delivered': len(latencies),
+        'missed': expected - len(latencies),
+        'miss_rate': (expected - len(latencies)) / expected if expected else 0.0,
+        'resyncs': sum(client.resyncs for client in clients),
+        'latencies': latencies
+    }
+
+def report(result, writes):
+    if result is None:
+        return
+    print(f"{result['subscribers']} subscribers: {writes} writes in {result['elapsed']:.2f}s, "
+          f"{result['delivered']} events delivered, {result['missed']} missed, {result['resyncs']} resyncs")
+    if result['latencies']:
+        ms = result['latencies']
+        print(f"  write -> event latency (ms): p50 {percentile(ms, 50):.1f}  "
+              f"p95 {percentile(ms, 95):.1f}  p99 {percentile(ms, 99):.1f}  max {max(ms):.1f}")
+
+def within_limits(result, max_p99, max_miss_rate):
+    if result is None or not result['latencies']:
+        return False
+    return percentile(result['latencies'], 99) <= max_p99 and result['miss_rate'] <= max_miss_rate
+
+def run_ramp(base_url, project_id, start, limit, writes, timeout, max_p99, max_miss_rate):
+    """Double the subscriber count until p99 latency or the miss rate passes its threshold."""
+    sustained = None
+    subscribers = start
+    while subscribers <= limit:
+        result = run_level(base_url, project_id, subscribers, writes, timeout)
+        if result is None:
+            print(f"{subscribers} subscribers: could not connect within {timeout}s")
+            break
+        report(result, writes)
+        if not within_limits(result, max_p99, max_miss_rate):
+            break
+        sustained = subscribers
+        subscribers *= 2
+        # Give the server a moment to drop the previous level's connections
+        time.sleep(1)
+
+    if sustained is None:
+        print(f"No level stayed within p99 <= {max_p99}ms and miss rate <= {max_miss_rate:.1%}")
+    else:
+        print(f"Sustained {sustained} subscribers within p99 <= {max_p99}ms and miss rate <= {max_miss_rate:.1%}")
+    return sustained
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Measure /api/events fan-out against a running backend.')
+    parser.add_argument('project_id', type=int, help='Project to create the scratch questions in')
+    parser.add_argument('--url', default='http://localhost:5000', help='Backend base URL')
+    parser.add_argument('--subscribers', type=int, default=100,
+                        help='Concurrent SSE clients (starting count with --ramp)')
+    parser.add_argument('--writes', type=int, default=50, help='Number of write requests to time per level')
+    parser.add_argument('--timeout', type=float, default=10.0, help='Seconds to wait for each event')
+    parser.add_argument('--ramp', action='store_true',
+                        help='Double subscribers until a threshold is exceeded')
+    parser.add_argument('--max-subscribers', type=int, default=4096, help='Upper bound for --ramp')
+    parser.add_argument('--max-p99', type=float, default=250.0, help='p99 latency limit in ms for --ramp')
+    parser.add_argument('--max-miss-rate', type=float, default=0.0, help='Missed event fraction limit for --ramp')
+    args = parser.parse_args()
+
+    try:
+        if args.ramp:
+            sustained = run_ramp(args.url, args.project_id, args.subscribers, args.max_subscribers,
+                                 args.writes, args.timeout, args.max_p99, args.max_miss_rate)
+            sys.exit(0 if sustained else 1)
+        result = run_level(args.url, args.project_id, args.subscribers, args.writes, args.timeout)
+        if result is None:
+            print(f"Error: subscribers did not connect within {args.timeout}s")
+            sys.exit(1)
+        report(result, args.writes)
+        sys.exit(0 if result['missed'] == 0 else 1)
+    except Exception as e:
+        print(f"Error: {str(e)}")
+        sys.exit(1)